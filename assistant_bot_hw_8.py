@@ -1,70 +1,141 @@
+import gzip
+import os
 import pickle
-from collections import UserDict
-from datetime import datetime, timedelta
+import re
+import sys
+from calendar import isleap
+from datetime import date, datetime, timedelta
 
 # ---------- КЛАСИ ----------
 
 class Field:
+    __slots__ = ("value",)
+
     def __init__(self, value):
         self.value = value
 
     def __str__(self):
         return str(self.value)
 
+    def __setstate__(self, state):
+        # Слоти пікляться як (None, {...}); файли до __slots__ містять звичайний dict
+        if isinstance(state, tuple):
+            state = state[1]
+        for key, value in state.items():
+            setattr(self, key, value)
+
 
 class Name(Field):
-    pass
+    __slots__ = ()
+
+    def __init__(self, value):
+        # Ключ у книзі та Name.value — той самий об'єкт рядка
+        super().__init__(sys.intern(value))
+
+
+# Таблиця для видалення ASCII-цифр: валідний номер після translate стає порожнім
+DIGITS_TABLE = str.maketrans("", "", "0123456789")
 
 
 class Phone(Field):
+    __slots__ = ()
+
     def __init__(self, value):
-        if not value.isdigit() or len(value) != 10:
+        if len(value) != 10 or value.translate(DIGITS_TABLE):
             raise ValueError("Phone number must contain exactly 10 digits.")
         super().__init__(value)
 
 
-class Birthday(Field):
-    def __init__(self, value):
+DATE_RE = re.compile(r"([0-9]{2})\.([0-9]{2})\.([0-9]{4})")
+
+
+def parse_date(value):
+    # Формат фіксований (DD.MM.YYYY): перевіряємо регуляркою, потім будуємо date
+    match = DATE_RE.fullmatch(value)
+    if match:
+        day, month, year = map(int, match.groups())
         try:
-            datetime.strptime(value, "%d.%m.%Y")
+            return date(year, month, day)
         except ValueError:
-            raise ValueError("Invalid date format. Use DD.MM.YYYY")
+            pass
+    raise ValueError("Invalid date format. Use DD.MM.YYYY")
+
+
+class Birthday(Field):
+    __slots__ = ("date",)
+    # Скільки дат створено: книга звіряє з ним свій індекс, щоб помітити зміни в обхід неї
+    created_count = 0
+
+    def __init__(self, value):
+        self.date = parse_date(value)
         self.value = value
+        Birthday.created_count += 1
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        if not hasattr(self, "date"):
+            # Старі файли зберігали лише рядок, перевірений через strptime (день і місяць
+            # могли бути без нуля попереду), тому і відновлюємо тим самим strptime
+            self.date = datetime.strptime(self.value, "%d.%m.%Y").date()
 
 
 class Record:
+    __slots__ = ("name", "phones", "birthday", "_phone_index")
+
     def __init__(self, name):
         self.name = Name(name)
         self.phones = []
         self.birthday = None
+        # Індекс номер -> Phone для пошуку за O(1)
+        self._phone_index = {}
+
+    def __getstate__(self):
+        return {"name": self.name, "phones": self.phones, "birthday": self.birthday}
+
+    def __setstate__(self, state):
+        # Старі файли (до __slots__) мають той самий dict, але без індексу номерів
+        if isinstance(state, tuple):
+            state = state[1]
+        self.name = state["name"]
+        self.birthday = state.get("birthday")
+        self.phones = []
+        self._phone_index = {}
+        for phone_obj in state.get("phones", []):
+            if phone_obj.value not in self._phone_index:
+                self._phone_index[phone_obj.value] = phone_obj
+                self.phones.append(phone_obj)
 
     def add_phone(self, phone):
-        self.phones.append(Phone(phone))
+        phone_obj = Phone(phone)
+        if phone_obj.value in self._phone_index:
+            raise ValueError("Phone number already exists.")
+        self._phone_index[phone_obj.value] = phone_obj
+        self.phones.append(phone_obj)
 
     def remove_phone(self, phone):
-        phone_obj = self.find_phone(phone)
+        phone_obj = self._phone_index.pop(phone, None)
         if phone_obj:
             self.phones.remove(phone_obj)
         else:
             raise ValueError("Phone number not found.")
 
     def edit_phone(self, old_phone, new_phone):
-        for phone in self.phones:
-            if phone.value == old_phone:
-                # Перевірити новий номер, якщо невалідний — не видаляти старий
-                try:
-                    new_phone_obj = Phone(new_phone)
-                except ValueError as e:
-                    raise ValueError("Invalid new phone number format.")
-                phone.value = new_phone_obj.value
-                return
-        raise ValueError("Old phone number not found.")
+        phone = self._phone_index.get(old_phone)
+        if phone is None:
+            raise ValueError("Old phone number not found.")
+        # Перевірити новий номер, якщо невалідний — не видаляти старий
+        try:
+            new_phone_obj = Phone(new_phone)
+        except ValueError as e:
+            raise ValueError("Invalid new phone number format.")
+        if new_phone_obj.value in self._phone_index and new_phone_obj.value != old_phone:
+            raise ValueError("New phone number already exists.")
+        del self._phone_index[old_phone]
+        phone.value = new_phone_obj.value
+        self._phone_index[phone.value] = phone
 
     def find_phone(self, phone):
-        for p in self.phones:
-            if p.value == phone:
-                return p
-        return None
+        return self._phone_index.get(phone)
 
     def add_birthday(self, bday):
         self.birthday = Birthday(bday)
@@ -73,58 +144,189 @@ class Record:
         return self.birthday.value if self.birthday else "No birthday set"
 
     def __str__(self):
-        phones_str = "; ".join(str(p) for p in self.phones)
+        phones_str = "; ".join(p.value for p in self.phones)
         bday = f", birthday: {self.show_birthday()}" if self.birthday else ""
         return f"Contact name: {self.name.value}, phones: {phones_str}{bday}"
 
 
-class AddressBook(UserDict):
+# Скільки днів до понеділка, якщо день припадає на вихідні (індекс — weekday())
+WEEKEND_SHIFT = (0, 0, 0, 0, 0, 2, 1)
+
+
+def day_of_year(month, day):
+    # Високосний 2000 рік, щоб 29.02 мав власний день (1..366)
+    return date(2000, month, day).timetuple().tm_yday
+
+
+class AddressBook(dict):
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        # Індекс днів народження: день року -> список пар (ключ, запис)
+        self._bday_index = [[] for _ in range(367)]
+        self.update(*args, **kwargs)
+        self._synced_count = Birthday.created_count
+
+    def __reduce__(self):
+        # Індекс не зберігаємо: його відбудовує __init__ під час завантаження
+        return (self.__class__, (dict(self),))
+
+    def __setstate__(self, state):
+        # Викликається лише для книг, збережених ще як UserDict: записи лежали
+        # в атрибуті data, а __init__ під час завантаження не виконувався
+        self._bday_index = [[] for _ in range(367)]
+        self.update(state.get("data", {}))
+        self._synced_count = Birthday.created_count
+
+    def _index_birthday(self, name, record):
+        if record.birthday:
+            bday = record.birthday.date
+            self._bday_index[day_of_year(bday.month, bday.day)].append((name, record))
+
+    def _unindex_birthday(self, name, record):
+        if record.birthday:
+            bday = record.birthday.date
+            bucket = self._bday_index[day_of_year(bday.month, bday.day)]
+            if (name, record) in bucket:
+                bucket.remove((name, record))
+
+    def _reindex_birthdays(self):
+        self._bday_index = [[] for _ in range(367)]
+        for name, record in self.items():
+            self._index_birthday(name, record)
+        self._synced_count = Birthday.created_count
+
+    def _bucket_names(self, doy):
+        # Запис міг змінитися в обхід книги (record.add_birthday або інша книга
+        # з тим самим записом), тож пропускаємо пари, що вже не відповідають дню
+        names = []
+        for name, record in self._bday_index[doy]:
+            if self.get(name) is record and record.birthday:
+                bday = record.birthday.date
+                if day_of_year(bday.month, bday.day) == doy:
+                    names.append(record.name.value)
+        return names
+
+    # Усі зміни словника йдуть через __setitem__/__delitem__, щоб індекс не застарів
+
+    def __setitem__(self, name, record):
+        old = self.get(name)
+        if old is not None:
+            self._unindex_birthday(name, old)
+        super().__setitem__(name, record)
+        self._index_birthday(name, record)
+
+    def __delitem__(self, name):
+        record = self[name]
+        super().__delitem__(name)
+        self._unindex_birthday(name, record)
+
+    def update(self, *args, **kwargs):
+        for name, record in dict(*args, **kwargs).items():
+            self[name] = record
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def setdefault(self, name, record=None):
+        if name not in self:
+            self[name] = record
+        return self[name]
+
+    def pop(self, name, *default):
+        if name not in self:
+            return super().pop(name, *default)
+        record = self[name]
+        del self[name]
+        return record
+
+    def popitem(self):
+        name, record = super().popitem()
+        self._unindex_birthday(name, record)
+        return name, record
+
+    def clear(self):
+        super().clear()
+        self._bday_index = [[] for _ in range(367)]
+
     def add_record(self, record):
-        self.data[record.name.value] = record
+        self[record.name.value] = record
+
+    def set_birthday(self, name, bday):
+        # Змінює день народження й оновлює індекс на місці, без повної перебудови
+        record = self[name]
+        in_sync = self._synced_count == Birthday.created_count
+        new_birthday = Birthday(bday)
+        self._unindex_birthday(name, record)
+        record.birthday = new_birthday
+        self._index_birthday(name, record)
+        if in_sync:
+            self._synced_count = Birthday.created_count
 
     def find(self, name):
-        return self.data.get(name)
+        return self.get(name)
 
     def delete(self, name):
-        if name in self.data:
-            del self.data[name]
+        if name in self:
+            del self[name]
 
     def get_upcoming_birthdays(self):
-        today = datetime.today().date()
+        today = date.today()
         upcoming = []
 
-        for record in self.data.values():
-            if record.birthday:
-                try:
-                    bday = datetime.strptime(record.birthday.value, "%d.%m.%Y").date()
-                except ValueError:
-                    continue
-
-                bday_this_year = bday.replace(year=today.year)
-                if bday_this_year < today:
-                    bday_this_year = bday_this_year.replace(year=today.year + 1)
-
-                days_diff = (bday_this_year - today).days
-                if 0 <= days_diff <= 7:
-                    if bday_this_year.weekday() >= 5:
-                        bday_this_year += timedelta(days=(7 - bday_this_year.weekday()))
-                    upcoming.append((record.name.value, bday_this_year.strftime("%d.%m.%Y")))
+        # Десь створили дату не через set_birthday цієї книги — індекс міг застаріти
+        if self._synced_count != Birthday.created_count:
+            self._reindex_birthdays()
+
+        # Переглядаємо лише 8 днів (сьогодні + 7), а не всю книгу
+        for i in range(8):
+            bday_this_year = today + timedelta(days=i)
+            doy = day_of_year(bday_this_year.month, bday_this_year.day)
+            names = self._bucket_names(doy)
+            # У невисокосний рік 29.02 святкуємо 1 березня
+            if doy == 61 and not isleap(bday_this_year.year):
+                names += self._bucket_names(60)
+            if not names:
+                continue
+
+            shift = WEEKEND_SHIFT[bday_this_year.weekday()]
+            if shift:
+                bday_this_year += timedelta(days=shift)
+            congrats = f"{bday_this_year.day:02d}.{bday_this_year.month:02d}.{bday_this_year.year}"
+            for name in names:
+                upcoming.append((name, congrats))
 
         return upcoming
 
     def __str__(self):
-        return "\n".join(str(record) for record in self.data.values())
+        return "\n".join(str(record) for record in self.values())
 
 # ---------- СЕРІАЛІЗАЦІЯ ----------
 
 DATA_FILE = "addressbook.pkl"
 
 def save_data(book):
-    with open(DATA_FILE, "wb") as f:
-        pickle.dump(book, f)
+    # Пишемо в тимчасовий файл і підміняємо, щоб збій не зіпсував збережену книгу
+    tmp_file = DATA_FILE + ".tmp"
+    try:
+        with open(tmp_file, "wb") as raw:
+            with gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=1) as f:
+                pickle.dump(book, f, protocol=pickle.HIGHEST_PROTOCOL)
+            # Дописати на диск до підміни, щоб після збою не лишився порожній файл
+            raw.flush()
+            os.fsync(raw.fileno())
+    except BaseException:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+        raise
+    os.replace(tmp_file, DATA_FILE)
 
 def load_data():
     try:
+        with gzip.open(DATA_FILE, "rb") as f:
+            return pickle.load(f)
+    except gzip.BadGzipFile:
+        # Старий формат без стиснення
         with open(DATA_FILE, "rb") as f:
             return pickle.load(f)
     except (FileNotFoundError, EOFError):
@@ -172,7 +374,7 @@ def show_phone(args, book):
 
 @input_error
 def show_all(args, book):
-    return str(book) if book.data else "Address book is empty."
+    return str(book) if book else "Address book is empty."
 
 @input_error
 def add_birthday(args, book):
@@ -180,7 +382,7 @@ def add_birthday(args, book):
     record = book.find(name)
     if not record:
         return f"No contact with name '{name}' found."
-    record.add_birthday(bday)
+    book.set_birthday(name, bday)
     return f"Birthday added for {name}."
 
 @input_error
@@ -196,7 +398,7 @@ def birthdays(args, book):
     upcoming = book.get_upcoming_birthdays()
     if not upcoming:
         return "No upcoming birthdays this week."
-    return "\n".join(f"{name}: {date}" for name, date in upcoming)
+    return "\n".join(f"{name}: {congrats_date}" for name, congrats_date in upcoming)
 
 # ---------- ПАРСИНГ КОМАНД ----------
 
@@ -208,39 +410,59 @@ def parse_input(user_input):
     args = parts[1:]
     return command, args
 
+# ---------- ТАБЛИЦЯ КОМАНД ----------
+
+COMMANDS = {
+    "add": add_contact,
+    "change": change_contact,
+    "phone": show_phone,
+    "add-birthday": add_birthday,
+    "show-birthday": show_birthday,
+    "birthdays": birthdays,
+    "all": show_all,
+}
+
+EXIT_COMMANDS = frozenset({"exit", "close", "goodbye", "good", "bye"})
+
 # ---------- ОСНОВНА ФУНКЦІЯ ----------
 
 def main():
     book = load_data()
-    print("Welcome! This is your assistant bot. Enter a command.")
+    # Пряма робота з потоками замість input()/print() — швидше для пакетного вводу
+    read_line = sys.stdin.readline
+    write = sys.stdout.write
+    flush = sys.stdout.flush
+    # Підказку скидаємо лише для живого вводу; пакетний вивід буферизується до кінця
+    interactive = sys.stdin.isatty()
+    write("Welcome! This is your assistant bot. Enter a command.\n")
 
     while True:
-        user_input = input(">>> ").strip()
+        write(">>> ")
+        if interactive:
+            flush()
+        line = read_line()
+        if not line:
+            # Кінець вводу (Ctrl+D або кінець файлу) — зберегти й вийти
+            save_data(book)
+            write("\n")
+            break
+        user_input = line.strip()
         if not user_input:
             continue
 
         command, args = parse_input(user_input)
 
-        if command == "add":
-            print(add_contact(args, book))
-        elif command == "change":
-            print(change_contact(args, book))
-        elif command == "phone":
-            print(show_phone(args, book))
-        elif command == "add-birthday":
-            print(add_birthday(args, book))
-        elif command == "show-birthday":
-            print(show_birthday(args, book))
-        elif command == "birthdays":
-            print(birthdays(args, book))
-        elif command == "all":
-            print(show_all(args, book))
-        elif command in ("exit", "close", "goodbye", "good", "bye"):
+        handler = COMMANDS.get(command)
+        if handler:
+            write(handler(args, book))
+            write("\n")
+        elif command in EXIT_COMMANDS:
             save_data(book)
-            print("Goodbye!")
+            write("Goodbye!\n")
             break
         else:
-            print("Unknown command. Try again.")
+            write("Unknown command. Try again.\n")
+    flush()
 
 # ---------- ЗАПУСК ----------
 
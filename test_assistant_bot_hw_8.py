@@ -0,0 +1,195 @@
+import base64
+import os
+import tempfile
+import unittest
+from calendar import isleap
+from datetime import date, timedelta
+from unittest import mock
+
+import assistant_bot_hw_8 as bot
+
+# addressbook.pkl, збережений початковою версією бота (AddressBook на UserDict,
+# класи без __slots__, pickle без стиснення): John з двома номерами і
+# днем народження "1.1.1990", Jane з одним номером
+LEGACY_PICKLE = base64.b64decode(
+    "gASVLAEAAAAAAACMEmFzc2lzdGFudF9ib3RfaHdfOJSMC0FkZHJlc3NCb29rlJOUKYGUfZSMBGRhdGGU"
+    "fZQojARKb2hulGgAjAZSZWNvcmSUk5QpgZR9lCiMBG5hbWWUaACMBE5hbWWUk5QpgZR9lIwFdmFsdWWU"
+    "aAdzYowGcGhvbmVzlF2UKGgAjAVQaG9uZZSTlCmBlH2UaBGMCjEyMzQ1Njc4OTCUc2JoFSmBlH2UaBGM"
+    "CjU1NTU1NTU1NTWUc2JljAhiaXJ0aGRheZRoAIwIQmlydGhkYXmUk5QpgZR9lGgRjAgxLjEuMTk5MJRz"
+    "YnVijARKYW5llGgJKYGUfZQoaAxoDimBlH2UaBFoInNiaBJdlGgVKYGUfZRoEYwKMTExMjIyMzMzM5Rz"
+    "YmFoHE51YnVzYi4="
+)
+
+
+class DataFileTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        data_file = os.path.join(self.tmp_dir.name, "addressbook.pkl")
+        patcher = mock.patch.object(bot, "DATA_FILE", data_file)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_load_legacy_pickle(self):
+        with open(bot.DATA_FILE, "wb") as f:
+            f.write(LEGACY_PICKLE)
+
+        book = bot.load_data()
+
+        self.assertIsInstance(book, bot.AddressBook)
+        self.assertEqual(sorted(book), ["Jane", "John"])
+        john = book.find("John")
+        self.assertEqual([p.value for p in john.phones], ["1234567890", "5555555555"])
+        self.assertIs(john.find_phone("5555555555"), john.phones[1])
+        self.assertEqual(john.birthday.date, date(1990, 1, 1))
+        self.assertEqual(str(book.find("Jane")), "Contact name: Jane, phones: 1112223333")
+
+        # Індекс днів народження відбудовано: зміна дня народження його оновлює
+        today = date.today()
+        book.set_birthday("John", f"{today.day:02d}.{today.month:02d}.2000")
+        self.assertIn("John", [name for name, _ in book.get_upcoming_birthdays()])
+
+        # Після повторного збереження книга читається вже з нового формату
+        bot.save_data(book)
+        self.assertEqual(sorted(bot.load_data()), ["Jane", "John"])
+
+    def test_save_and_load(self):
+        book = bot.AddressBook()
+        record = bot.Record("Ann")
+        record.add_phone("1234567890")
+        record.add_birthday("29.02.2000")
+        book.add_record(record)
+
+        bot.save_data(book)
+        loaded = bot.load_data()
+
+        self.assertEqual(str(loaded), str(book))
+        self.assertEqual(loaded.find("Ann").birthday.date, date(2000, 2, 29))
+        self.assertFalse(os.path.exists(bot.DATA_FILE + ".tmp"))
+
+    def test_failed_save_keeps_old_file(self):
+        book = bot.AddressBook()
+        book.add_record(bot.Record("Ann"))
+        bot.save_data(book)
+
+        with mock.patch.object(bot.pickle, "dump", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                bot.save_data(bot.AddressBook())
+
+        self.assertFalse(os.path.exists(bot.DATA_FILE + ".tmp"))
+        self.assertEqual(list(bot.load_data()), ["Ann"])
+
+
+def fixed_today(year, month, day):
+    class FixedDate(date):
+        @classmethod
+        def today(cls):
+            return cls(year, month, day)
+
+    return mock.patch.object(bot, "date", FixedDate)
+
+
+def occurrence(bday, year):
+    if (bday.month, bday.day) == (2, 29) and not isleap(year):
+        return date(year, 3, 1)
+    return date(year, bday.month, bday.day)
+
+
+def make_book(**birthdays):
+    book = bot.AddressBook()
+    for name, bday in birthdays.items():
+        record = bot.Record(name)
+        record.add_birthday(bday)
+        book.add_record(record)
+    return book
+
+
+class UpcomingBirthdaysTest(unittest.TestCase):
+    def test_leap_day_in_common_year_moves_to_march_first(self):
+        book = make_book(Leap="29.02.2000")
+        with fixed_today(2027, 2, 26):
+            self.assertEqual(book.get_upcoming_birthdays(), [("Leap", "01.03.2027")])
+
+    def test_leap_day_in_leap_year(self):
+        book = make_book(Leap="29.02.2000")
+        with fixed_today(2028, 2, 26):
+            self.assertEqual(book.get_upcoming_birthdays(), [("Leap", "29.02.2028")])
+
+    def test_weekend_birthdays_move_to_monday(self):
+        book = make_book(Fri="16.10.1990", Sat="17.10.1991", Sun="18.10.1992")
+        with fixed_today(2026, 10, 12):
+            self.assertEqual(
+                book.get_upcoming_birthdays(),
+                [("Fri", "16.10.2026"), ("Sat", "19.10.2026"), ("Sun", "19.10.2026")],
+            )
+
+    def test_window_wraps_into_next_year(self):
+        book = make_book(
+            Past="27.12.1990", Eve="31.12.1990", Sat="02.01.1991", Last="04.01.1992", Late="05.01.1993"
+        )
+        with fixed_today(2026, 12, 28):
+            self.assertEqual(
+                book.get_upcoming_birthdays(),
+                [("Eve", "31.12.2026"), ("Sat", "04.01.2027"), ("Last", "04.01.2027")],
+            )
+
+    def test_index_follows_book_changes(self):
+        with fixed_today(2026, 10, 12):
+            book = make_book(Ann="14.10.1990", Bob="15.10.1990", Eve="16.10.1990")
+            record = bot.Record("Kate")
+            book.add_record(record)
+
+            book.set_birthday("Kate", "13.10.1990")
+            self.assertIn(("Kate", "13.10.2026"), book.get_upcoming_birthdays())
+            book.set_birthday("Kate", "01.01.1990")
+            self.assertNotIn("Kate", [name for name, _ in book.get_upcoming_birthdays()])
+
+            # Зміна запису напряму, в обхід книги, теж видна
+            record.add_birthday("12.10.1990")
+            self.assertIn(("Kate", "12.10.2026"), book.get_upcoming_birthdays())
+
+            book.delete("Ann")
+            self.assertEqual(book.pop("Bob").name.value, "Bob")
+            self.assertEqual(
+                book.get_upcoming_birthdays(), [("Kate", "12.10.2026"), ("Eve", "16.10.2026")]
+            )
+
+            book.clear()
+            self.assertEqual(book.get_upcoming_birthdays(), [])
+
+    def test_matches_linear_scan_over_two_years(self):
+        # Кожен день 2027-2028 років, із днем народження на кожен день року
+        book = make_book(**{
+            f"P{doy}": (date(2000, 1, 1) + timedelta(days=doy - 1)).strftime("%d.%m.%Y")
+            for doy in range(1, 367)
+        })
+        day = date(2027, 1, 1)
+        while day < date(2029, 1, 1):
+            expected = set()
+            for record in book.values():
+                bday = occurrence(record.birthday.date, day.year)
+                if bday < day:
+                    bday = occurrence(record.birthday.date, day.year + 1)
+                if (bday - day).days <= 7:
+                    bday += timedelta(days=(0, 0, 0, 0, 0, 2, 1)[bday.weekday()])
+                    expected.add((record.name.value, bday.strftime("%d.%m.%Y")))
+            with fixed_today(day.year, day.month, day.day):
+                self.assertEqual(set(book.get_upcoming_birthdays()), expected, day)
+            day += timedelta(days=1)
+
+    def test_shared_record_between_books(self):
+        with fixed_today(2026, 10, 12):
+            book = make_book(Ann="12.10.1990")
+            copy = bot.AddressBook(book)
+            del copy["Ann"]
+            book.find("Ann").add_birthday("01.01.1990")
+            self.assertEqual(book.get_upcoming_birthdays(), [])
+
+            copy = bot.AddressBook(book)
+            book.set_birthday("Ann", "13.10.1990")
+            self.assertEqual(book.get_upcoming_birthdays(), [("Ann", "13.10.2026")])
+            self.assertEqual(copy.get_upcoming_birthdays(), [("Ann", "13.10.2026")])
+
+
+if __name__ == "__main__":
+    unittest.main()